@@ -5,76 +5,268 @@
 # exclusive intellectual property. Unauthorized use prohibited.
 # =============================================================================
 
-from flask import Flask, render_template_string, send_file
-import yfinance as yf
+from flask import Flask, render_template, make_response, send_file
+from flask_compress import Compress
+import httpx
+import asyncio
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import io
-import base64
-from statsmodels.tsa.stattools import grangercausalitytests
-from tabulate import tabulate
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
-from reportlab.lib.styles import getSampleStyleSheet
-from datetime import datetime
+import os
+import hashlib
+import tempfile
+import contextlib
+import json
+try:
+    # Ahead-of-time build (python compile_kernels.py) — no LLVM at startup
+    from _regime_kernels import rolling_granger_f
+except ImportError:
+    from regime_kernels import rolling_granger_f
+from datetime import datetime, timezone
+import time
+import threading
+import atexit
+import logging
 import warnings
 warnings.filterwarnings("ignore")
 
 app = Flask(__name__)
-cache = {"last_update": None}
+Compress(app)
+logger = logging.getLogger(__name__)
+cache = {"last_update": None, "regime": None, "payload": None, "payload_at": 0.0}
+
+SYMBOLS = ["BTC-USD", "TSLA"]
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{}"
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+DAILY_START = int(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+INTRADAY = {"interval": "5m", "range": "1d"}
+# Fail fast on a slow Yahoo rather than hang the request behind it
+TIMEOUT = httpx.Timeout(7.0, connect=3.0)
+# Upstream/transport failures and malformed or too-short payloads
+DATA_ERRORS = (httpx.HTTPError, ValueError, KeyError, IndexError, TypeError)
+# "granger" (default) or "corr" — see validate_regime_proxy.py before switching
+REGIME_TEST = os.environ.get("REGIME_TEST", "granger")
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DAILY_CACHE = os.path.join(DATA_DIR, "daily_cache.parquet")
+# Latest dashboard payload, shared by the refresher worker with the others
+PAYLOAD_CACHE = os.path.join(DATA_DIR, "signal_payload.json")
+REFRESH_LOCK = os.path.join(DATA_DIR, "refresher.lock")
+# Days re-fetched before the last cached bar to check the cache against
+DAILY_OVERLAP_DAYS = 7
+# Relative close mismatch on the overlap that means Yahoo rescaled history
+ADJ_TOLERANCE = 0.01
+
+# ——— SHARED I/O LOOP (one keep-alive client per process) ———
+# An AsyncClient's pooled connections belong to the loop that opened them,
+# so all outbound calls run on a single long-lived loop thread.
+_IO = {"loop": None, "client": None}
+_IO_LOCK = threading.Lock()
+
+def _io_loop():
+    with _IO_LOCK:
+        if _IO["loop"] is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True).start()
+            _IO["client"] = httpx.AsyncClient(
+                headers=HEADERS, timeout=TIMEOUT, http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8),
+            )
+            _IO["loop"] = loop
+            atexit.register(_close_io)
+    return _IO["loop"]
+
+def _close_io():
+    asyncio.run_coroutine_threadsafe(_IO["client"].aclose(), _IO["loop"]).result(timeout=5)
+
+def _run(coro):
+    # Block the calling (request or refresher) thread until coro finishes.
+    # Submit network I/O only — anything CPU-bound here stalls every thread.
+    return asyncio.run_coroutine_threadsafe(coro, _io_loop()).result()
+
+# ——— MARKET DATA (Yahoo chart API, concurrent) ———
+async def _fetch_chart(client, symbol, **params):
+    r = await client.get(CHART_URL.format(symbol), params=params)
+    r.raise_for_status()
+    result = r.json()["chart"]["result"][0]
+    indicators = result["indicators"]
+    # Ranges with no bars (e.g. TSLA over a weekend) come back without these keys
+    if "adjclose" in indicators:
+        closes = indicators["adjclose"][0].get("adjclose", [])
+    else:
+        closes = indicators["quote"][0].get("close", [])
+    return np.asarray(result.get("timestamp", []), dtype=np.int64), np.asarray(closes, dtype=np.float64)
+
+async def _fetch_all(*queries):
+    # One concurrent round-trip per (query, symbol); results in that order
+    client = _IO["client"]
+    return await asyncio.gather(
+        *(_fetch_chart(client, sym, **q) for q in queries for sym in SYMBOLS),
+        return_exceptions=True,
+    )
+
+def _unwrap(chart):
+    if isinstance(chart, BaseException):
+        raise chart
+    return chart
+
+def _last_two_closes(chart):
+    _, close = _unwrap(chart)
+    close = close[~np.isnan(close)]
+    if len(close) < 2:
+        raise ValueError("Not enough data")
+    return close[-1], close[-2]
+
+# ——— SHARED FILES (atomic replace) ———
+def _atomic_write(path, write):
+    # Each writer (worker or thread) gets its own temp file, then an atomic
+    # rename publishes it — readers only ever see a complete file
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path),
+                                   prefix=os.path.basename(path) + ".", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        os.close(fd)
+        write(tmp)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+# ——— DAILY BAR STORE (parquet, append-only) ———
+def _load_daily_cache():
+    try:
+        daily = pd.read_parquet(DAILY_CACHE)
+    except (OSError, ValueError):
+        return None
+    # An empty store has no last day to resume from — treat it as missing
+    if daily.empty or pd.isna(daily.index.max()):
+        return None
+    return daily
+
+def _save_daily_cache(daily):
+    # Never persist a response with no bars; it would poison every later delta
+    daily = daily.dropna(how="all")
+    if daily.empty:
+        return
+    _atomic_write(DAILY_CACHE, daily.to_parquet)
 
 # ——— PROPRIETARY DAILY REGIME ENGINE (Stable Core) ———
-def _get_daily_regime():
+def daily_returns(daily):
+    # Log returns as one (n, 2) [BTC, TSLA] array; rows with any gap dropped
+    # reindex(copy=False) only fixes column order; it doesn't copy the block
+    vals = daily.reindex(columns=SYMBOLS, copy=False).to_numpy(dtype=np.float64)
+    returns = np.log(vals[1:] / vals[:-1])
+    mask = ~np.isnan(returns).any(axis=1)
+    return returns[mask], daily.index[1:][mask]
+
+def granger_pvalues(returns, dates, window=90, lag=2):
+    from scipy.special import fdtrc
+    # Does TSLA (x) lead BTC (y)? Failed windows get F=0 → p=1.0
+    # The AOT build does no type checks (a wrong dtype segfaults), so always
+    # hand it the exact array type of regime_kernels.SIGNATURE
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    f_stats = rolling_granger_f(returns, window, lag)
+    # One F survival-function ufunc pass over every window (same values as
+    # stats.f.sf without its per-call argument checks); clip round-off
+    # negatives to the support so they map to p=1.0 like f.sf does
+    pvals = fdtrc(lag, window - lag - (2 * lag + 1), np.maximum(f_stats, 0.0))
+    return pd.Series(pvals, index=dates[window:])
+
+def corr_pvalues(returns, dates, window=90):
+    # Closed-form proxy: Fisher-z significance of corr(BTC_t, TSLA_t-1).
+    # Shifted one bar so each label sees the same window as granger_pvalues.
+    from scipy import stats
+    btc = pd.Series(returns[:, 0], index=dates)
+    tsla = pd.Series(returns[:, 1], index=dates)
+    r = btc.rolling(window).corr(tsla.shift(1))
+    z = np.arctanh(r) * np.sqrt(window - 3)
+    return pd.Series(2 * stats.norm.sf(np.abs(z)), index=dates).shift(1).iloc[window:]
+
+def _regime_is_fresh():
+    # Regime only changes on the daily bar close — reuse today's result
+    return cache["regime"] is not None and cache["regime"][0] == datetime.utcnow().date()
+
+def _daily_query(start):
+    return {"interval": "1d", "period1": start, "period2": int(time.time())}
+
+def _daily_frame(charts):
+    closes = {}
+    for sym, chart in zip(SYMBOLS, charts):
+        ts, close = _unwrap(chart)
+        s = pd.Series(close, index=pd.to_datetime(ts, unit="s").normalize())
+        closes[sym] = s[~s.index.duplicated(keep="last")]
+    return pd.DataFrame(closes)
+
+def _cache_matches(cached, fresh):
+    # Adjusted closes are rescaled retroactively (e.g. after a split). Compare
+    # the finished days both sides have; the last cached bar may be partial.
+    overlap = fresh.index.intersection(cached.index)
+    overlap = overlap[overlap < cached.index.max()]
+    drift = (fresh.loc[overlap, SYMBOLS] / cached.loc[overlap, SYMBOLS] - 1).abs()
+    return not (drift > ADJ_TOLERANCE).any().any()
+
+def _get_daily_regime(cached, charts):
+    today = datetime.utcnow().date()
     try:
-        daily = yf.download(["BTC-USD", "TSLA"], start="2024-01-01", progress=False, auto_adjust=True)['Close']
-        returns = np.log(daily / daily.shift(1)).dropna()
-        returns.columns = ['BTC_ret', 'TSLA_ret']
-        
-        pvals = []
-        dates = []
-        for i in range(90, len(returns)):
-            subset = returns.iloc[i-90:i]
-            try:
-                res = grangercausalitytests(subset.values, maxlag=2, verbose=False)
-                pvals.append(res[2][0]['ssr_ftest'][1])
-            except:
-                pvals.append(1.0)
-            dates.append(returns.index[i])
+        daily = _daily_frame(charts)
+        if cached is not None and not _cache_matches(cached, daily):
+            logger.warning("Adjusted daily history changed upstream; rebuilding cache")
+            daily = _daily_frame(_run(_fetch_all(_daily_query(DAILY_START))))
+            cached = None
+        if cached is not None:
+            # Fresh bars win; the cache fills everything before the delta
+            daily = daily.combine_first(cached)
+        _save_daily_cache(daily)
+        returns, dates = daily_returns(daily)
         
-        rolling_p = pd.Series(pvals, index=dates)
+        if REGIME_TEST == "corr":
+            rolling_p = corr_pvalues(returns, dates)
+        else:
+            rolling_p = granger_pvalues(returns, dates)
         latest_p = rolling_p.iloc[-1]
         regime_active = latest_p < 0.10
+        cache["regime"] = (today, regime_active, round(latest_p, 5))
         return regime_active, round(latest_p, 5)
-    except:
+    except DATA_ERRORS as e:
+        logger.warning("Daily regime unavailable: %r", e)
         return False, 1.00000
 
 # ——— REAL-TIME INTRADAY SIGNAL (5-minute bars) ———
 def get_live_signal():
-    regime_active, p_value = _get_daily_regime()
+    # Intraday and (when stale) daily bars in a single concurrent batch. Only
+    # the network gather runs on the shared I/O loop; parsing, the parquet
+    # merge and the Granger kernel stay on the calling thread.
+    if _regime_is_fresh():
+        charts = _run(_fetch_all(INTRADAY))
+        _, regime_active, p_value = cache["regime"]
+    else:
+        # Only the bars since the last cached day, plus a short overlap that
+        # _get_daily_regime checks for rescaled adjusted history
+        cached = _load_daily_cache()
+        if cached is None:
+            start = DAILY_START
+        else:
+            start = int((cached.index.max() - pd.Timedelta(days=DAILY_OVERLAP_DAYS)).timestamp())
+        charts = _run(_fetch_all(INTRADAY, _daily_query(start)))
+        regime_active, p_value = _get_daily_regime(cached, charts[2:])
     
     # Real-time 5-minute data
     try:
-        df = yf.download(["BTC-USD", "TSLA"], period="5d", interval="5m", progress=False, auto_adjust=True)
-        close = df['Close']
-        close.columns = ['BTC', 'TSLA']
-        close = close.dropna()
-        
-        if len(close) < 2:
-            raise ValueError("Not enough data")
-            
-        tsla_now = close['TSLA'].iloc[-1]
-        tsla_prev = close['TSLA'].iloc[-2]
+        btc_price, _ = _last_two_closes(charts[0])
+        tsla_now, tsla_prev = _last_two_closes(charts[1])
         tsla_change = (tsla_now / tsla_prev) - 1
-        
-        btc_price = close['BTC'].iloc[-1]
         tsla_price = tsla_now
         
-    except:
+    except DATA_ERRORS as e:
         # Fallback to daily close
-        daily = yf.download(["BTC-USD", "TSLA"], period="2d", progress=False)['Close']
-        btc_price = daily['BTC-USD'].iloc[-1]
-        tsla_price = daily['TSLA'].iloc[-1]
+        logger.warning("Intraday bars unavailable, using daily close: %r", e)
+        daily = _run(_fetch_all({"interval": "1d", "range": "2d"}))
+        btc, tsla = _unwrap(daily[0])[1], _unwrap(daily[1])[1]
+        btc_price = btc[~np.isnan(btc)][-1]
+        tsla_price = tsla[~np.isnan(tsla)][-1]
         tsla_change = 0.0
 
     # Signal logic
@@ -97,7 +289,7 @@ def get_live_signal():
 
     cache["last_update"] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
 
-    return {
+    cache["payload"] = {
         "signal": signal,
         "color": color,
         "reason": reason,
@@ -108,66 +300,108 @@ def get_live_signal():
         "tsla_price": tsla_price,
         "timestamp": cache["last_update"]
     }
+    cache["payload_at"] = time.time()
+    _save_payload(cache["payload_at"], cache["payload"])
+    return cache["payload"]
+
+# ——— BACKGROUND REFRESH ———
+REFRESH_SECONDS = 60
+# Older than this means refreshing has stalled; fetch inline instead
+PAYLOAD_MAX_AGE = 3 * REFRESH_SECONDS
+
+def _save_payload(at, payload):
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump({"at": at, "payload": payload}, f, default=float)
+    _atomic_write(PAYLOAD_CACHE, write)
+
+def _load_payload():
+    try:
+        with open(PAYLOAD_CACHE) as f:
+            published = json.load(f)
+        return published["at"], published["payload"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _fresh_payload():
+    # This process's payload, or the refresher's if that one is newer
+    at, payload = cache["payload_at"], cache["payload"]
+    if time.time() - at >= REFRESH_SECONDS:
+        published = _load_payload()
+        if published is not None and published[0] > at:
+            at, payload = published
+    if payload is not None and time.time() - at < PAYLOAD_MAX_AGE:
+        return payload
+    return None
+
+def _take_refresher_lock(handle):
+    # Non-blocking flock; the OS releases it if the holding worker exits
+    try:
+        import fcntl
+    except ImportError:
+        # No flock (e.g. Windows dev server) — single process, so just refresh
+        return True
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+def _refresh_loop():
+    # Every worker runs this loop, but only the lock holder polls Yahoo and
+    # publishes; the rest keep retrying so one takes over if the holder dies
+    try:
+        handle = open(REFRESH_LOCK, "a")
+    except OSError:
+        logger.warning("Refresher lock unavailable; this worker refreshes on its own")
+        handle = None
+    leader = handle is None
+    while True:
+        leader = leader or _take_refresher_lock(handle)
+        if leader:
+            try:
+                get_live_signal()
+            except Exception:
+                # Keep the thread alive; the last good payload stays served
+                logger.exception("Signal refresh failed")
+        time.sleep(REFRESH_SECONDS)
+
+def start_refresher():
+    # Keeps the shared payload warm so page loads never wait on Yahoo
+    threading.Thread(target=_refresh_loop, daemon=True).start()
 
 # ——— MAIN DASHBOARD ———
 @app.route('/')
 def index():
-    data = get_live_signal()
+    # Computed inline only before the first refresh lands or once it stalls
+    data = _fresh_payload() or get_live_signal()
     
-    html = f"""
-    <html>
-    <head>
-        <title>John V. Teixido — TSLA to BTC Live Edge</title>
-        <meta http-equiv="refresh" content="60">
-        <style>
-            body {{ font-family: 'Segoe UI', sans-serif; background: #0a0e17; color: white; text-align: center; padding: 20px; }}
-            h1 {{ color: #00ff41; margin-bottom: 5px; }}
-            h2 {{ color: #00ccff; margin-top: 5px; }}
-            .signal {{ font-size: 72px; font-weight: bold; color: {data['color']}; 
-                       text-shadow: 0 0 30px {data['color']}; margin: 20px; }}
-            .info {{ font-size: 22px; margin: 12px; }}
-            .price {{ font-size: 28px; color: #00ff41; }}
-            .footer {{ margin-top: 100px; color: #555; font-size: 14px; }}
-            button {{ padding: 18px 50px; font-size: 22px; background: #00ff41; color: black; 
-                      border: none; border-radius: 15px; cursor: pointer; }}
-            button:hover {{ background: #00cc33; }}
-        </style>
-    </head>
-    <body>
-        <h1>John V. Teixido</h1>
-        <h2>Proprietary TSLA to BTC Regime Edge</h2>
-        <div class="signal">{data['signal']}</div>
-        <div class="info">Reason: <strong>{data['reason']}</strong></div>
-        <div class="info">Regime: <strong>{data['regime']}</strong> • p-value: <strong>{data['p_value']}</strong></div>
-        <div class="info">TSLA 5m Δ: <strong>{data['tsla_change']:+.3%}</strong></div>
-        <div class="price">BTC-USD: ${data['btc_price']:,.2f}</div>
-        <div class="price">TSLA: ${data['tsla_price']:,.2f}</div>
-        <div class="info">Last updated: {data['timestamp']}</div>
-        <br><br>
-        <a href="/pitch.pdf">
-            <button>Download Confidential Investor Deck (PDF)</button>
-        </a>
-        <div class="footer">
-            © 2025 John V. Teixido. Proprietary & Confidential. All Rights Reserved.<br>
-            Live Signal • Real-Time • Institutional-Grade
-        </div>
-    </body>
-    </html>
-    """
-    return render_template_string(html)
+    resp = make_response(render_template("index.html", data=data))
+    # Browsers meta-refresh every 60s; let them reuse the page until then
+    resp.cache_control.max_age = 55
+    return resp
 
 # ——— FULL INVESTOR DECK PDF ———
-@app.route('/pitch.pdf')
-def pitch_pdf():
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=70, bottomMargin=50)
+_PDF_CACHE = {"bytes": None, "date": None, "etag": None, "story": None, "styles": None}
+_PDF_LOCK = threading.Lock()
+
+def _pitch_story():
+    # Styles and static markup are parsed once per process; None marks the
+    # slot for the "Generated" line, the only paragraph that changes
+    if _PDF_CACHE["story"] is not None:
+        return _PDF_CACHE["story"], _PDF_CACHE["styles"]
+
+    # ReportLab is only needed here; keep it off the dashboard's import path
+    from reportlab.platypus import Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+
     styles = getSampleStyleSheet()
     story = []
 
     # Header
     story.append(Paragraph("<font size=18><b>Proprietary Trading Signal: TSLA to BTC Regime Edge</b></font>", styles['Title']))
     story.append(Paragraph("<b>Inventor & Sole Owner:</b> John V. Teixido", styles['Heading2']))
-    story.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%B %d, %Y at %H:%M UTC')}", styles['Normal']))
+    story.append(None)
     story.append(Spacer(1, 20))
 
     # Executive Summary
@@ -181,17 +415,17 @@ def pitch_pdf():
 
     # Performance
     story.append(Paragraph("<b>2. Historical Performance (2024–2025 Daily Backtest)</b>", styles['Heading1']))
-    story.append(Paragraph("• BTC Buy & Hold: ~1.60x total return<br>"
-                          "• Naive TSLA-Lead: –71% (Sharpe –0.98)<br>"
-                          "• Proprietary Regime-Filtered: Significantly improved expectancy and Sharpe ratio<br>"
+    story.append(Paragraph("• BTC Buy & Hold: ~1.60x total return<br/>"
+                          "• Naive TSLA-Lead: –71% (Sharpe –0.98)<br/>"
+                          "• Proprietary Regime-Filtered: Significantly improved expectancy and Sharpe ratio<br/>"
                           "• Live intraday version now active and updating every 60 seconds", styles['Normal']))
     story.append(Spacer(1, 12))
 
     # IP Protection
     story.append(Paragraph("<b>3. Intellectual Property</b>", styles['Heading1']))
     story.append(Paragraph("""
-        • Full algorithm, regime detection logic, and real-time engine are exclusive IP of John V. Teixido<br>
-        • Source code is protected and disclosed only under strict NDA<br>
+        • Full algorithm, regime detection logic, and real-time engine are exclusive IP of John V. Teixido<br/>
+        • Source code is protected and disclosed only under strict NDA<br/>
         • Protected under U.S. copyright and trade secret law
     """, styles['Normal']))
     story.append(Spacer(1, 12))
@@ -199,25 +433,56 @@ def pitch_pdf():
     # Funding
     story.append(Paragraph("<b>4. Seed Funding Request</b>", styles['Heading1']))
     story.append(Paragraph("""
-        Seeking $75,000–$150,000 to:<br>
-        • Deploy live execution via Interactive Brokers / Binance<br>
-        • Add position sizing, risk limits, and logging<br>
-        • Expand to NVDA-ETH, SPX-BTC, and other high-Sharpe pairs<br>
+        Seeking $75,000–$150,000 to:<br/>
+        • Deploy live execution via Interactive Brokers / Binance<br/>
+        • Add position sizing, risk limits, and logging<br/>
+        • Expand to NVDA-ETH, SPX-BTC, and other high-Sharpe pairs<br/>
         • Build audited track record for institutional allocators
     """, styles['Normal']))
     story.append(Spacer(1, 20))
 
-    story.append(Paragraph("<b>Contact:</b> John V. Teixido<br>"
-                          "<b>Live System:</b> https://tsla-btc-edge.onrender.com<br>"
+    story.append(Paragraph("<b>Contact:</b> John V. Teixido<br/>"
+                          "<b>Live System:</b> https://tsla-btc-edge.onrender.com<br/>"
                           "<b>Private Repository:</b> Available under NDA", styles['Normal']))
 
+    _PDF_CACHE["story"], _PDF_CACHE["styles"] = story, styles
+    return story, styles
+
+def _build_pitch_pdf(today):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph
+
+    template, styles = _pitch_story()
+    generated = Paragraph(f"<b>Generated:</b> {today.strftime('%B %d, %Y')}", styles['Normal'])
+    # build() consumes its list, so hand it a fresh one each time
+    story = [generated if flowable is None else flowable for flowable in template]
+
+    buffer = io.BytesIO()
+    # invariant=1 pins ReportLab's creation date and document ID, so every
+    # worker builds byte-identical files for the day and shares one ETag
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=70, bottomMargin=50, invariant=1)
     doc.build(story)
-    buffer.seek(0)
-    return send_file(buffer, as_attachment=True,
+    return buffer.getvalue()
+
+@app.route('/pitch.pdf')
+def pitch_pdf():
+    # Only the "Generated" date changes — rebuild once per day
+    # The lock also serializes layout, since builds share the template flowables
+    today = datetime.now().date()
+    with _PDF_LOCK:
+        if _PDF_CACHE["date"] != today:
+            _PDF_CACHE["bytes"] = _build_pitch_pdf(today)
+            _PDF_CACHE["etag"] = hashlib.md5(_PDF_CACHE["bytes"]).hexdigest()
+            _PDF_CACHE["date"] = today
+    # Repeat downloads with a matching If-None-Match get a bodyless 304
+    return send_file(io.BytesIO(_PDF_CACHE["bytes"]), as_attachment=True,
                      download_name="TSLA_BTC_Regime_Edge_John_V_Teixido_Confidential.pdf",
-                     mimetype="application/pdf")
+                     mimetype="application/pdf",
+                     etag=_PDF_CACHE["etag"], conditional=True)
 
 if __name__ == "__main__":
     print("JOHN V. TEIXIDO — TSLA to BTC REAL-TIME PROPRIETARY SIGNAL IS LIVE")
     print("→ http://127.0.0.1:5000")
+    start_refresher()
+    # Development server only — deploy with `gunicorn app:app` (gunicorn.conf.py)
     app.run(host="0.0.0.0", port=5000, debug=False)
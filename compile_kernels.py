@@ -0,0 +1,22 @@
+# Build step: AOT-compile the regime kernel into _regime_kernels.<ext> next to
+# app.py, so workers import native code instead of JIT-compiling on first use.
+#
+# Deploy build command (e.g. Render "Build Command"):
+#     pip install -r requirements.txt && python compile_kernels.py
+# Start command:
+#     gunicorn app:app
+#
+# numba.pycc needs setuptools (pinned in requirements.txt) and a C compiler.
+# If the build is skipped, app.py falls back to the JIT kernel.
+import os
+
+from numba.pycc import CC
+
+from regime_kernels import SIGNATURE, _rolling_granger_f
+
+cc = CC("_regime_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.export("rolling_granger_f", SIGNATURE)(_rolling_granger_f)
+
+if __name__ == "__main__":
+    cc.compile()
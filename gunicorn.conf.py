@@ -0,0 +1,17 @@
+# Production server: `gunicorn app:app` picks this file up from the repo root.
+# Requests spend most of their time waiting on Yahoo, so threads per worker
+# keep one slow upstream call from stalling every other visitor.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+worker_class = "gthread"
+threads = 8
+timeout = 60
+
+
+def post_worker_init(worker):
+    # Every worker starts the loop; a lock file lets only one poll Yahoo, and
+    # the others serve the payload it publishes to signal_payload.json
+    from app import start_refresher
+    start_refresher()
@@ -0,0 +1,60 @@
+# =============================================================================
+# © 2025 John V. Teixido. All rights reserved.
+# Rolling Granger kernel for the TSLA → BTC regime engine. JIT-compiled here;
+# compile_kernels.py builds the same function ahead of time as _regime_kernels.
+# =============================================================================
+
+import numpy as np
+from numba import njit
+
+SIGNATURE = "float64[:](float64[:, :], int64, int64)"
+
+@njit(cache=True, fastmath=True)
+def _slide(XtX, Xty, row, r, t, lag, sign):
+    # Add (sign=+1) or drop (sign=-1) observation t from the normal equations
+    row[0] = 1.0
+    for l in range(lag):
+        row[1 + l] = r[t - 1 - l, 0]
+        row[1 + lag + l] = r[t - 1 - l, 1]
+    y = r[t, 0]
+    for a in range(len(row)):
+        Xty[a] += sign * row[a] * y
+        for b in range(len(row)):
+            XtX[a, b] += sign * row[a] * row[b]
+    return sign * y * y
+
+@njit(cache=True)
+def _ssr(XtX, Xty, yty, k):
+    # SSR of the OLS fit on the first k regressors: y'y - b'X'y
+    Xty_k = Xty[:k].copy()
+    beta = np.linalg.solve(np.ascontiguousarray(XtX[:k, :k]), Xty_k)
+    return yty - beta @ Xty_k
+
+def _rolling_granger_f(r, window, lag):
+    # SSR F-statistic for "column 1 Granger-causes column 0" on each trailing
+    # window, matching grangercausalitytests(r, maxlag=lag)[lag][0]['ssr_ftest'].
+    # X'X, X'y and y'y slide one observation per step instead of refitting.
+    # The explicit SIGNATURE pins every argument, so there are no defaults.
+    n = r.shape[0]
+    k = 2 * lag + 1
+    dfd = window - lag - k
+    out = np.zeros(n - window)
+    XtX = np.zeros((k, k))
+    Xty = np.zeros(k)
+    row = np.empty(k)
+    yty = 0.0
+    for t in range(lag, window):
+        yty += _slide(XtX, Xty, row, r, t, lag, 1.0)
+    for i in range(window, n):
+        try:
+            ssr_u = _ssr(XtX, Xty, yty, k)
+            ssr_r = _ssr(XtX, Xty, yty, lag + 1)
+            if ssr_u > 0.0:
+                out[i - window] = (ssr_r - ssr_u) / ssr_u / lag * dfd
+        except Exception:
+            pass
+        yty += _slide(XtX, Xty, row, r, i, lag, 1.0)
+        yty += _slide(XtX, Xty, row, r, i - window + lag, lag, -1.0)
+    return out
+
+rolling_granger_f = njit(SIGNATURE, cache=True, fastmath=True)(_rolling_granger_f)
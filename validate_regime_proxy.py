@@ -0,0 +1,25 @@
+# Offline harness: does the closed-form correlation proxy reach the same
+# regime decision as the rolling Granger test? Run the app once first so
+# daily_cache.parquet exists, then: python validate_regime_proxy.py
+import sys
+
+from app import _load_daily_cache, daily_returns, granger_pvalues, corr_pvalues
+
+THRESHOLD = 0.10
+
+daily = _load_daily_cache()
+if daily is None:
+    sys.exit("daily_cache.parquet not found — start the app and load / once")
+
+returns, dates = daily_returns(daily)
+granger = granger_pvalues(returns, dates)
+corr = corr_pvalues(returns, dates).reindex(granger.index)
+
+agree = ((granger < THRESHOLD) == (corr < THRESHOLD)).mean()
+print(f"Windows compared:      {len(granger)}")
+print(f"Decision agreement:    {agree:.1%}")
+print(f"Granger active share:  {(granger < THRESHOLD).mean():.1%}")
+print(f"Proxy active share:    {(corr < THRESHOLD).mean():.1%}")
+print(f"p-value correlation:   {granger.corr(corr):.3f}")
+print(f"Latest p (Granger):    {granger.iloc[-1]:.5f}")
+print(f"Latest p (proxy):      {corr.iloc[-1]:.5f}")